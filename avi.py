@@ -1,8 +1,14 @@
 from __future__ import annotations
 import random
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
+try:  # optional: Parquet output
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
 
 # ----------------------------
 # 1) Configuration
@@ -12,8 +18,10 @@ NUM_ROWS = 5000
 START_DATE = datetime(2025, 6, 1)          # any start date is fine
 DAYS_SPAN = 30                              # data spans 30 days
 OUTPUT_PATH = "privacy_risk_monitoring_dataset.csv"
+PARQUET_PATH = "privacy_risk_monitoring_dataset.parquet"  # written only if pyarrow is installed
 
 random.seed(SEED)
+rng = np.random.default_rng(SEED)
 
 # Staff distribution (exact)
 roles = (
@@ -27,6 +35,10 @@ roles = (
 users = [f"U{str(i+1).zfill(3)}" for i in range(len(roles))]  # U001..U300
 user_role_map = dict(zip(users, roles))
 
+users_by_role = {role: [] for role in dict.fromkeys(roles)}
+for user, role in user_role_map.items():
+    users_by_role[role].append(user)
+
 role_department = {
     "Doctor": "Clinical",
     "Nurse": "Clinical",
@@ -44,6 +56,16 @@ role_risk_weight = {
     "Receptionist": 4
 }
 
+# AccessCountPerDay is a simulated daily volume indicator (not the count of rows).
+# Inclusive (low, high) range per role; tune for realism.
+role_access_range = {
+    "Doctor": (40, 90),
+    "Nurse": (25, 60),
+    "Pharmacist": (10, 30),
+    "Admin": (5, 20),
+    "Receptionist": (5, 15)
+}
+
 actions = ["View", "Edit", "Export"]
 action_weights = [0.75, 0.20, 0.05]         # mostly View
 
@@ -57,10 +79,6 @@ location_weights = [0.75, 0.25]
 # ----------------------------
 # 2) Helper functions
 # ----------------------------
-def random_timestamp(start: datetime, days_span: int) -> datetime:
-    minutes = random.randint(0, days_span * 24 * 60 - 1)
-    return start + timedelta(minutes=minutes)
-
 def is_weekend(day_name: str) -> int:
     return 1 if day_name in ["Saturday", "Sunday"] else 0
 
@@ -84,73 +102,74 @@ def compute_risk_score(role: str, action: str, sensitivity: str, off_hours_flag:
 # ----------------------------
 # 3) Generate dataset
 # ----------------------------
-rows = []
-for i in range(NUM_ROWS):
-    user = random.choice(users)
-    role = user_role_map[user]
-    dept = role_department[role]
-
-    ts = random_timestamp(START_DATE, DAYS_SPAN)
-    hour = ts.hour
-    day_name = ts.strftime("%A")
-
-    weekend_flag = is_weekend(day_name)
-    off_hours_flag = is_off_hours(hour)
-
-    action = random.choices(actions, weights=action_weights, k=1)[0]
-    sensitivity = random.choices(sensitivities, weights=sensitivity_weights, k=1)[0]
-    location = random.choices(locations, weights=location_weights, k=1)[0]
-
-    # AccessCountPerDay is a simulated daily volume indicator (not the count of rows).
-    # Tune per role for realism.
-    if role == "Doctor":
-        access_count_per_day = random.randint(40, 90)
-    elif role == "Nurse":
-        access_count_per_day = random.randint(25, 60)
-    elif role == "Pharmacist":
-        access_count_per_day = random.randint(10, 30)
-    elif role == "Admin":
-        access_count_per_day = random.randint(5, 20)
-    else:  # Receptionist
-        access_count_per_day = random.randint(5, 15)
-
-    risk_score = compute_risk_score(role, action, sensitivity, off_hours_flag)
-
-    rows.append({
-        "AccessID": f"A{str(i+1).zfill(5)}",
-        "UserID": user,
-        "UserRole": role,
-        "Department": dept,
-        "Timestamp": ts,
-        "DayOfWeek": day_name,
-        "HourOfDay": hour,
-        "PatientID": f"P{random.randint(100, 999)}",
-        "ActionType": action,
-        "DataSensitivity": sensitivity,
-        "AccessLocation": location,
-        "AccessCountPerDay": access_count_per_day,
-        "IsOffHours": off_hours_flag,
-        "IsWeekend": weekend_flag,
-        "RoleRiskWeight": role_risk_weight[role],
-        "AccessRiskScore": risk_score
-    })
+# Every random column is drawn in one batched call instead of once per row.
+user_idx = rng.integers(0, len(users), NUM_ROWS)
+user_arr = np.array(users)[user_idx]
+role_arr = np.array(roles)[user_idx]
+dept_arr = np.array([role_department[role] for role in roles])[user_idx]
+role_weight_arr = np.array([role_risk_weight[role] for role in roles])[user_idx]
+access_lo_arr = np.array([role_access_range[role][0] for role in roles])[user_idx]
+access_hi_arr = np.array([role_access_range[role][1] for role in roles])[user_idx]
+
+action_arr = rng.choice(actions, size=NUM_ROWS, p=action_weights)
+sensitivity_arr = rng.choice(sensitivities, size=NUM_ROWS, p=sensitivity_weights)
+location_arr = rng.choice(locations, size=NUM_ROWS, p=location_weights)
+
+minutes = rng.integers(0, DAYS_SPAN * 24 * 60, NUM_ROWS)
+ts_arr = np.datetime64(START_DATE) + minutes.astype("timedelta64[m]")
+ts_idx = pd.DatetimeIndex(ts_arr)
+hour_arr = ts_idx.hour.to_numpy()
+dow_arr = ts_idx.dayofweek.to_numpy()
+day_name_arr = ts_idx.day_name().to_numpy()
+
+# Same rules as is_weekend / is_off_hours, as boolean masks over whole columns
+weekend_arr = (dow_arr >= 5).astype(int)
+off_hours_arr = ((hour_arr < 8) | (hour_arr > 18)).astype(int)
+access_count_arr = rng.integers(access_lo_arr, access_hi_arr + 1)
+
+access_id_arr = np.char.add("A", np.char.zfill(np.arange(1, NUM_ROWS + 1).astype(str), 5))
+patient_id_arr = np.char.add("P", rng.integers(100, 1000, NUM_ROWS).astype(str))
+
+# Same scoring as compute_risk_score, evaluated over whole columns
+risk_arr = (
+    role_weight_arr * 10
+    + np.where(sensitivity_arr == "High", 30, 0)
+    + np.where(action_arr == "Export", 20, 0)
+    + off_hours_arr * 20
+)
 
-df = pd.DataFrame(rows)
+df = pd.DataFrame({
+    "AccessID": access_id_arr,
+    "UserID": user_arr,
+    "UserRole": role_arr,
+    "Department": dept_arr,
+    "Timestamp": ts_arr,
+    "DayOfWeek": day_name_arr,
+    "HourOfDay": hour_arr,
+    "PatientID": patient_id_arr,
+    "ActionType": action_arr,
+    "DataSensitivity": sensitivity_arr,
+    "AccessLocation": location_arr,
+    "AccessCountPerDay": access_count_arr,
+    "IsOffHours": off_hours_arr,
+    "IsWeekend": weekend_arr,
+    "RoleRiskWeight": role_weight_arr,
+    "AccessRiskScore": risk_arr
+})
 
 
 # ----------------------------
 # 4) OPTIONAL: Inject evaluation scenarios (A–E)
 #    Enable any of these blocks if you want guaranteed test cases.
+#    A, C, D and E return a new DataFrame with the extra rows appended in a
+#    single concat, e.g. df = inject_scenario_c(df).
 # ----------------------------
 
 # Scenario A: Admin at 03:00 Tuesday
-def inject_scenario_a(df_: pd.DataFrame) -> None:
-    admin_users = [u for u in users if user_role_map[u] == "Admin"]
-    u = random.choice(admin_users)
-    # Find a date that is a Tuesday within the span
-    base = START_DATE
-    while base.strftime("%A") != "Tuesday":
-        base += timedelta(days=1)
+def inject_scenario_a(df_: pd.DataFrame) -> pd.DataFrame:
+    u = random.choice(users_by_role["Admin"])
+    # First Tuesday within the span (Monday=0, Tuesday=1)
+    base = START_DATE + timedelta(days=(1 - START_DATE.weekday()) % 7)
     ts = base.replace(hour=3, minute=0, second=0, microsecond=0)
     row = {
         "AccessID": f"A{str(len(df_)+1).zfill(5)}",
@@ -170,57 +189,61 @@ def inject_scenario_a(df_: pd.DataFrame) -> None:
         "RoleRiskWeight": role_risk_weight["Admin"],
         "AccessRiskScore": compute_risk_score("Admin", "View", "Normal", 1),
     }
-    df_.loc[len(df_)] = row
+    return pd.concat([df_, pd.DataFrame([row])], ignore_index=True)
 
 # Scenario B: Receptionist extreme daily volume (set one row's AccessCountPerDay=500)
 def inject_scenario_b(df_: pd.DataFrame) -> None:
-    rec_users = [u for u in users if user_role_map[u] == "Receptionist"]
-    u = random.choice(rec_users)
-    idx = df_[df_["UserID"] == u].sample(1, random_state=SEED).index[0]
-    df_.at[idx, "AccessCountPerDay"] = 500
+    u = random.choice(users_by_role["Receptionist"])
+    idx = rng.choice(np.flatnonzero(df_["UserID"].to_numpy() == u))
+    df_.iat[idx, df_.columns.get_loc("AccessCountPerDay")] = 500
 
 # Scenario C: Non-clinical user with many High sensitivity accesses
-def inject_scenario_c(df_: pd.DataFrame, n: int = 30) -> None:
-    non_clin = [u for u in users if user_role_map[u] in ["Admin", "Receptionist"]]
-    u = random.choice(non_clin)
-    for _ in range(n):
-        ts = random_timestamp(START_DATE, DAYS_SPAN)
+def inject_scenario_c(df_: pd.DataFrame, n: int = 30) -> pd.DataFrame:
+    non_clin = users_by_role["Admin"] + users_by_role["Receptionist"]
+    u = rng.choice(non_clin)
+    actions_all = rng.choice(actions, size=n, p=action_weights)
+    patient_nums = rng.integers(100, 1000, n)
+    access_counts = rng.integers(5, 21, n)
+    minutes = rng.integers(0, DAYS_SPAN * 24 * 60, n)
+    ts_all = pd.DatetimeIndex(np.datetime64(START_DATE) + minutes.astype("timedelta64[m]"))
+    day_names = ts_all.day_name()
+    new_rows = []
+    for i in range(n):
+        ts = ts_all[i]
         hour = ts.hour
-        day_name = ts.strftime("%A")
+        day_name = day_names[i]
         off_hours_flag = is_off_hours(hour)
         weekend_flag = is_weekend(day_name)
-        action = random.choices(actions, weights=action_weights, k=1)[0]
-        row = {
-            "AccessID": f"A{str(len(df_)+1).zfill(5)}",
+        action = actions_all[i]
+        new_rows.append({
+            "AccessID": f"A{str(len(df_)+i+1).zfill(5)}",
             "UserID": u,
             "UserRole": user_role_map[u],
             "Department": "Admin",
             "Timestamp": ts,
             "DayOfWeek": day_name,
             "HourOfDay": hour,
-            "PatientID": f"P{random.randint(100, 999)}",
+            "PatientID": f"P{patient_nums[i]}",
             "ActionType": action,
             "DataSensitivity": "High",
             "AccessLocation": "Remote",
-            "AccessCountPerDay": random.randint(5, 20),
+            "AccessCountPerDay": access_counts[i],
             "IsOffHours": off_hours_flag,
             "IsWeekend": weekend_flag,
             "RoleRiskWeight": role_risk_weight[user_role_map[u]],
             "AccessRiskScore": compute_risk_score(user_role_map[u], action, "High", off_hours_flag),
-        }
-        df_.loc[len(df_)] = row
+        })
+    return pd.concat([df_, pd.DataFrame(new_rows)], ignore_index=True)
 
 # Scenario D: Sunday afternoon export
-def inject_scenario_d(df_: pd.DataFrame) -> None:
+def inject_scenario_d(df_: pd.DataFrame) -> pd.DataFrame:
     u = random.choice(users)
-    # Find a Sunday within the span
-    base = START_DATE
-    while base.strftime("%A") != "Sunday":
-        base += timedelta(days=1)
+    # First Sunday within the span (Sunday=6)
+    base = START_DATE + timedelta(days=(6 - START_DATE.weekday()) % 7)
     ts = base.replace(hour=15, minute=0, second=0, microsecond=0)  # afternoon
     role = user_role_map[u]
     row = {
-        "AccessID": f"A{str(len(df)+1).zfill(5)}",
+        "AccessID": f"A{str(len(df_)+1).zfill(5)}",
         "UserID": u,
         "UserRole": role,
         "Department": role_department[role],
@@ -237,16 +260,15 @@ def inject_scenario_d(df_: pd.DataFrame) -> None:
         "RoleRiskWeight": role_risk_weight[role],
         "AccessRiskScore": compute_risk_score(role, "Export", "High", 0),
     }
-    df_.loc[len(df_)] = row
+    return pd.concat([df_, pd.DataFrame([row])], ignore_index=True)
 
 # Scenario E: Normal doctor flow (50 during working hours)
-def inject_scenario_e(df_: pd.DataFrame) -> None:
-    doc_users = [u for u in users if user_role_map[u] == "Doctor"]
-    u = random.choice(doc_users)
+def inject_scenario_e(df_: pd.DataFrame) -> pd.DataFrame:
+    u = random.choice(users_by_role["Doctor"])
     base = START_DATE.replace(hour=10, minute=0, second=0, microsecond=0)  # standard hours
     ts = base
     row = {
-        "AccessID": f"A{str(len(df)+1).zfill(5)}",
+        "AccessID": f"A{str(len(df_)+1).zfill(5)}",
         "UserID": u,
         "UserRole": "Doctor",
         "Department": "Clinical",
@@ -263,14 +285,32 @@ def inject_scenario_e(df_: pd.DataFrame) -> None:
         "RoleRiskWeight": role_risk_weight["Doctor"],
         "AccessRiskScore": compute_risk_score("Doctor", "View", "Normal", 0),
     }
-    df_.loc[len(df_)] = row
+    return pd.concat([df_, pd.DataFrame([row])], ignore_index=True)
 
 
-df = df.head(NUM_ROWS)
-
 # 5) Save
 
+# All integer columns are small. They are downcast only here, after any scenario
+# injection, because concat with the scenario rows widens them back to int64.
+df = df.astype({
+    "HourOfDay": "int8",
+    "IsOffHours": "int8",
+    "IsWeekend": "int8",
+    "RoleRiskWeight": "int8",
+    "AccessCountPerDay": "int16",
+    "AccessRiskScore": "int16",
+})
+
+# Low-cardinality text columns are stored as categoricals (int8 codes + a small lookup).
+# Done here, after any scenario injection, because concat with plain-string rows drops the dtype.
+for col in ["UserRole", "Department", "DayOfWeek", "ActionType", "DataSensitivity", "AccessLocation"]:
+    df[col] = df[col].astype("category")
+
 df.to_csv(OUTPUT_PATH, index=False)
 print(f"Saved {len(df)} rows to {OUTPUT_PATH}")
 
+if pa is not None:
+    df.to_parquet(PARQUET_PATH, index=False, compression="zstd")
+    print(f"Saved {len(df)} rows to {PARQUET_PATH}")
+
 
@@ -0,0 +1,48 @@
+"""Tests for the synthetic dataset generator in avi.py."""
+import re
+import runpy
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = REPO_ROOT / "avi.py"
+CSV_NAME = "privacy_risk_monitoring_dataset.csv"
+
+
+def run_script(workdir: Path, monkeypatch: pytest.MonkeyPatch) -> bytes:
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    runpy.run_path(str(SCRIPT), run_name="__main__")
+    return (workdir / CSV_NAME).read_bytes()
+
+
+def test_csv_does_not_depend_on_pyarrow(tmp_path, monkeypatch):
+    # The CSV feeds Dashboard.pbix, so it must be byte-identical with or without pyarrow
+    with_arrow = run_script(tmp_path / "with_arrow", monkeypatch)
+    monkeypatch.setitem(sys.modules, "pyarrow", None)  # makes `import pyarrow` raise ImportError
+    without_arrow = run_script(tmp_path / "without_arrow", monkeypatch)
+    assert with_arrow == without_arrow
+
+
+def test_csv_matches_dashboard_format(tmp_path, monkeypatch):
+    lines = run_script(tmp_path / "out", monkeypatch).decode().splitlines()
+    baseline_header = (REPO_ROOT / CSV_NAME).read_text().splitlines()[0]
+    assert lines[0] == baseline_header
+    assert len(lines) == 5000 + 1
+    assert '"' not in "".join(lines)
+    timestamp = lines[1].split(",")[4]
+    assert re.fullmatch(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", timestamp)
+
+
+def test_parquet_matches_csv_with_compact_dtypes(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    pd = pytest.importorskip("pandas")
+    run_script(tmp_path / "out", monkeypatch)
+    from_parquet = pd.read_parquet(tmp_path / "out" / "privacy_risk_monitoring_dataset.parquet")
+    assert from_parquet["UserRole"].dtype == "category"
+    assert from_parquet["HourOfDay"].dtype == "int8"
+    assert from_parquet["AccessRiskScore"].dtype == "int16"
+    from_csv = pd.read_csv(tmp_path / "out" / CSV_NAME, parse_dates=["Timestamp"])
+    pd.testing.assert_frame_equal(from_parquet, from_csv, check_dtype=False, check_categorical=False)